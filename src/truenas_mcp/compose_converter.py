@@ -1,17 +1,36 @@
 """Docker Compose to TrueNAS Custom App converter."""
 
-import os
-import re
-from typing import Any, Dict, List
+import posixpath
+import sys
+from typing import Any, Dict, FrozenSet, List
 
 import structlog
-import yaml
 
 logger = structlog.get_logger(__name__)
 
 # Max YAML input size (100KB)
 MAX_YAML_SIZE = 100 * 1024
 
+# Values repeated in every converted service; interned so all result dicts
+# share one string object per value
+_RESTART_POLICY = sys.intern("unless-stopped")
+_DEFAULT_TAG = sys.intern("latest")
+_NETWORK_BRIDGE = sys.intern("bridge")
+_PROTO_TCP = sys.intern("tcp")
+_PROTOCOLS = {"tcp": _PROTO_TCP, "udp": sys.intern("udp")}
+_TYPE_HOST_PATH = sys.intern("host_path")
+_TYPE_IX_VOLUME = sys.intern("ix_volume")
+
+# Ordinal storage keys ("volume_0", "volume_1", ...) shared by every service
+_VOLUME_KEYS = tuple(sys.intern(f"volume_{i}") for i in range(16))
+
+
+def _volume_key(index: int) -> str:
+    """Return the storage key for the volume at ``index``."""
+    if index < len(_VOLUME_KEYS):
+        return _VOLUME_KEYS[index]
+    return f"volume_{index}"
+
 
 class DockerComposeConverter:
     """Converts Docker Compose YAML to TrueNAS Custom App format."""
@@ -28,8 +47,13 @@ class DockerComposeConverter:
                 f"YAML input exceeds maximum size of {MAX_YAML_SIZE} bytes"
             )
 
+        # Deferred so importing the converter doesn't load PyYAML up front
+        import yaml
+
+        from .validators import SAFE_LOADER
+
         try:
-            compose_data = yaml.safe_load(compose_yaml)
+            compose_data = yaml.load(compose_yaml, Loader=SAFE_LOADER)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML: {e}")
 
@@ -37,52 +61,66 @@ class DockerComposeConverter:
         if not services:
             raise ValueError("No services found in Docker Compose")
 
-        converted_services = []
-        for service_name, service_config in services.items():
-            converted = self._convert_service(service_name, service_config)
-            converted_services.append(converted)
+        # Top-level named volumes, looked up once per volume spec
+        top_volumes = compose_data.get("volumes")
+        named_volumes = (
+            frozenset(top_volumes) if isinstance(top_volumes, dict) else frozenset()
+        )
+
+        converted_services = [
+            self._convert_service(service_name, service_config, named_volumes)
+            for service_name, service_config in services.items()
+        ]
 
         truenas_config = {
             "name": app_name,
             "services": converted_services,
-            "restart_policy": "unless-stopped",
+            "restart_policy": _RESTART_POLICY,
         }
 
         return truenas_config
 
     def _convert_service(
-        self, service_name: str, service_config: Dict[str, Any]
+        self,
+        service_name: str,
+        service_config: Dict[str, Any],
+        named_volumes: FrozenSet[str] = frozenset(),
     ) -> Dict[str, Any]:
-        """Convert a single Docker Compose service to TrueNAS format."""
-        image_str = service_config.get("image", "")
+        """Convert a single Docker Compose service to TrueNAS format.
+
+        Reads each sub-key of the service once and hands the raw values to the
+        emitters, so the service dict is walked in a single pass.
+        """
+        get = service_config.get
+        image_str = get("image", "")
+        ports = get("ports", [])
+        volumes = get("volumes", [])
+        environment = get("environment", [])
 
         return {
             "name": service_name,
-            "image": {
-                "repository": image_str.split(":")[0],
-                "tag": (
-                    image_str.split(":")[-1]
-                    if ":" in image_str
-                    else "latest"
-                ),
-            },
-            "network": self._convert_network(service_config),
-            "storage": self._convert_storage(service_config),
-            "environment": self._convert_environment(service_config),
+            "image": self._convert_image(image_str),
+            "network": self._convert_network(ports),
+            "storage": self._convert_storage(volumes, named_volumes),
+            "environment": self._convert_environment(environment),
         }
 
-    def _convert_network(self, service_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert network configuration."""
-        network_config: Dict[str, Any] = {"type": "bridge"}
+    def _convert_image(self, image_str: str) -> Dict[str, str]:
+        """Split an image reference into repository and tag."""
+        parts = image_str.split(":")
+        return {
+            "repository": parts[0],
+            "tag": parts[-1] if len(parts) > 1 else _DEFAULT_TAG,
+        }
 
-        ports = service_config.get("ports", [])
-        if ports:
-            port_forwards = []
-            for port in ports:
-                parsed = self._parse_port(port)
-                if parsed:
-                    port_forwards.append(parsed)
+    def _convert_network(self, ports: List[Any]) -> Dict[str, Any]:
+        """Convert a service's port list to network configuration."""
+        network_config: Dict[str, Any] = {"type": _NETWORK_BRIDGE}
 
+        if ports:
+            port_forwards = [
+                parsed for port in ports if (parsed := self._parse_port(port))
+            ]
             if port_forwards:
                 network_config["port_forwards"] = port_forwards
 
@@ -97,7 +135,7 @@ class DockerComposeConverter:
             return {
                 "host_port": port,
                 "container_port": port,
-                "protocol": "tcp",
+                "protocol": _PROTO_TCP,
             }
 
         if not isinstance(port, str):
@@ -107,18 +145,19 @@ class DockerComposeConverter:
             return None
 
         # Strip protocol suffix (e.g., /udp, /tcp)
-        protocol = "tcp"
-        port_str = port
-        proto_match = re.match(r"^(.+)/(tcp|udp)$", port_str)
-        if proto_match:
-            port_str = proto_match.group(1)
-            protocol = proto_match.group(2)
-
-        parts = port_str.split(":")
+        protocol = _PROTO_TCP
+        port_str, sep, proto = port.rpartition("/")
+        if sep and port_str and proto in _PROTOCOLS:
+            protocol = _PROTOCOLS[proto]
+        else:
+            port_str = port
+
+        host_str, _, rest = port_str.partition(":")
+        container_str, _, _ = rest.partition(":")
         try:
-            host_port = int(parts[0])
-            container_port = int(parts[1])
-        except (ValueError, IndexError):
+            host_port = int(host_str)
+            container_port = int(container_str)
+        except ValueError:
             logger.warning("Skipping invalid port mapping", port=port)
             return None
 
@@ -128,51 +167,62 @@ class DockerComposeConverter:
             "protocol": protocol,
         }
 
-    def _convert_storage(self, service_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert storage/volumes configuration."""
-        storage_config: Dict[str, Any] = {}
-
-        volumes = service_config.get("volumes", [])
-        for i, volume in enumerate(volumes):
-            if isinstance(volume, str):
-                if ":" in volume:
-                    host_path, container_path = volume.split(":")[:2]
-                    read_only = ":ro" in volume
-
-                    storage_key = f"volume_{i}"
-                    # Normalize host path to prevent traversal
-                    normalized = os.path.normpath(host_path)
-                    if normalized.startswith("/mnt/"):
-                        storage_config[storage_key] = {
-                            "type": "host_path",
-                            "host_path": normalized,
-                            "mount_path": container_path,
-                            "read_only": read_only,
-                        }
-                    else:
-                        # Named volume -> IX volume
-                        # Strip leading underscores/slashes from dataset name
-                        dataset_name = host_path.strip("/").replace("/", "_")
-                        storage_config[storage_key] = {
-                            "type": "ix_volume",
-                            "ix_volume_config": {
-                                "dataset_name": dataset_name,
-                                "acl_enable": False,
-                            },
-                            "mount_path": container_path,
-                        }
-
-        return storage_config
-
-    def _convert_environment(self, service_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert environment variables."""
+    def _convert_storage(
+        self, volumes: List[Any], named_volumes: FrozenSet[str] = frozenset()
+    ) -> Dict[str, Any]:
+        """Convert a service's volume list to storage configuration."""
+        return {
+            _volume_key(i): self._build_volume_entry(volume, named_volumes)
+            for i, volume in enumerate(volumes)
+            if isinstance(volume, str) and ":" in volume
+        }
+
+    def _build_volume_entry(
+        self, volume: str, named_volumes: FrozenSet[str] = frozenset()
+    ) -> Dict[str, Any]:
+        """Build a host_path or ix_volume entry from a "src:dst[:mode]" spec."""
+        host_path, _, rest = volume.partition(":")
+        container_path, _, _ = rest.partition(":")
+        read_only = ":ro" in volume
+
+        # Declared named volumes can skip path normalization entirely
+        if host_path in named_volumes:
+            return self._ix_volume_entry(host_path, container_path)
+
+        # Normalize host path to prevent traversal (POSIX rules on every OS)
+        normalized = posixpath.normpath(host_path)
+        if normalized.startswith("/mnt/"):
+            return {
+                "type": _TYPE_HOST_PATH,
+                "host_path": normalized,
+                "mount_path": container_path,
+                "read_only": read_only,
+            }
+
+        # Named volume -> IX volume
+        return self._ix_volume_entry(host_path, container_path)
+
+    def _ix_volume_entry(self, host_path: str, container_path: str) -> Dict[str, Any]:
+        """Build an ix_volume entry for a named volume."""
+        # Strip leading underscores/slashes from dataset name
+        dataset_name = host_path.strip("/").replace("/", "_")
+        return {
+            "type": _TYPE_IX_VOLUME,
+            "ix_volume_config": {
+                "dataset_name": dataset_name,
+                "acl_enable": False,
+            },
+            "mount_path": container_path,
+        }
+
+    def _convert_environment(self, environment: Any) -> Dict[str, Any]:
+        """Convert environment variables given in list or mapping form."""
         env_config: Dict[str, Any] = {}
 
-        environment = service_config.get("environment", [])
         if isinstance(environment, list):
             for env_var in environment:
-                if "=" in env_var:
-                    key, value = env_var.split("=", 1)
+                key, sep, value = env_var.partition("=")
+                if sep:
                     env_config[key] = value
         elif isinstance(environment, dict):
             env_config = environment
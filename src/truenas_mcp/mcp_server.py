@@ -13,7 +13,7 @@ Supports two transport modes selected by the ``MCP_TRANSPORT`` env var:
 import asyncio
 import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import structlog
 from mcp.server import Server
@@ -27,6 +27,36 @@ from .truenas_client import TrueNASClient
 logger = structlog.get_logger(__name__)
 
 
+def _parse_bool(value: str) -> bool:
+    """Parse a "true"/"false" environment flag."""
+    return value.lower() == "true"
+
+
+# (config key, environment variable, converter, raw default)
+_ENV_SPEC: Tuple[Tuple[str, str, Callable[[str], Any], Optional[str]], ...] = (
+    ("truenas_host", "TRUENAS_HOST", str, "nas.pvnkn3t.lan"),
+    ("truenas_password", "TRUENAS_PASSWORD", str, None),
+    ("truenas_api_key", "TRUENAS_API_KEY", str, None),
+    ("truenas_username", "TRUENAS_USERNAME", str, "mcp-service"),
+    ("truenas_port", "TRUENAS_PORT", int, "443"),
+    ("truenas_protocol", "TRUENAS_PROTOCOL", str, "wss"),
+    ("ssl_verify", "TRUENAS_SSL_VERIFY", _parse_bool, "true"),
+    ("debug_mode", "DEBUG_MODE", _parse_bool, "false"),
+    ("mock_mode", "MOCK_TRUENAS", _parse_bool, "false"),
+    ("discovery_mode", "MCP_DISCOVERY_MODE", _parse_bool, "false"),
+)
+
+
+def _load_config() -> Dict[str, Any]:
+    """Build the server configuration from the environment in a single pass."""
+    get = os.environ.get
+    config: Dict[str, Any] = {}
+    for key, env_var, convert, default in _ENV_SPEC:
+        raw = get(env_var, default)
+        config[key] = None if raw is None else convert(raw)
+    return config
+
+
 class TrueNASMCPServer:
     """MCP Server for TrueNAS Scale Custom Apps management."""
 
@@ -39,18 +69,7 @@ class TrueNASMCPServer:
         self._init_lock = asyncio.Lock()
         
         # Configuration from environment
-        self.config = {
-            "truenas_host": os.getenv("TRUENAS_HOST", "nas.pvnkn3t.lan"),
-            "truenas_password": os.getenv("TRUENAS_PASSWORD"),
-            "truenas_api_key": os.getenv("TRUENAS_API_KEY"),
-            "truenas_username": os.getenv("TRUENAS_USERNAME", "mcp-service"),
-            "truenas_port": int(os.getenv("TRUENAS_PORT", "443")),
-            "truenas_protocol": os.getenv("TRUENAS_PROTOCOL", "wss"),
-            "ssl_verify": os.getenv("TRUENAS_SSL_VERIFY", "true").lower() == "true",
-            "debug_mode": os.getenv("DEBUG_MODE", "false").lower() == "true",
-            "mock_mode": os.getenv("MOCK_TRUENAS", "false").lower() == "true",
-            "discovery_mode": os.getenv("MCP_DISCOVERY_MODE", "false").lower() == "true",
-        }
+        self.config = _load_config()
         
         # Setup logging
         self._setup_logging()
@@ -130,11 +149,23 @@ class TrueNASMCPServer:
 
     async def _initialize_clients(self) -> None:
         """Initialize TrueNAS client and tools handler (thread-safe)."""
+        # Fast path: skip the lock once initialized. Safe without the lock
+        # because the event loop only switches tasks at await points.
+        if self._clients_initialized():
+            return
         async with self._init_lock:
-            if self.tools_handler is not None:
-                return  # Already initialized
+            if self._clients_initialized():
+                return  # Initialized by another task while we waited
             await self._do_initialize_clients()
 
+    def _clients_initialized(self) -> bool:
+        """Return whether the tools handler has been created.
+
+        A method call rather than an inline check, so the re-check under the
+        lock isn't narrowed away by the fast-path check before it.
+        """
+        return self.tools_handler is not None
+
     async def _do_initialize_clients(self) -> None:
         """Perform actual client initialization."""
         if self.config["mock_mode"]:
@@ -1,6 +1,7 @@
 """MCP Tools implementation for TrueNAS Scale Custom Apps."""
 
-from typing import Any, Dict, List, Optional
+import functools
+from typing import Any, Dict, List, Optional, Tuple
 
 import structlog
 from mcp.types import TextContent, Tool
@@ -29,8 +30,19 @@ class MCPToolsHandler:
         self.client = truenas_client
 
     async def list_tools(self) -> List[Tool]:
-        """List all available MCP tools."""
-        return [
+        """List all available MCP tools (built once per process)."""
+        return list(self._build_tool_list())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_tool_list() -> Tuple[Tool, ...]:
+        """Build the static tool definitions and their input schemas.
+
+        The definitions don't depend on the client, so every handler (the
+        static listing handler and the live one) shares a single tuple;
+        list_tools hands each caller its own list.
+        """
+        return (
             # Connection Management
             Tool(
                 name="test_connection",
@@ -773,7 +785,7 @@ class MCPToolsHandler:
                     "additionalProperties": False,
                 },
             ),
-        ]
+        )
 
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> TextContent:
         """Execute an MCP tool by name."""
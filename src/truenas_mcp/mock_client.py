@@ -1,19 +1,89 @@
 """Mock TrueNAS client for development and testing."""
 
 import asyncio
+import copy
 import random
-from typing import Any, Dict, List, Optional, Tuple
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+class AppNotFound(LookupError):
+    """Mock app lookup error."""
+
+
+class VMNotFound(LookupError):
+    """Mock VM lookup error."""
+
+
+class COWDict(MutableMapping):
+    """Dict over a read-only base whose writes land in a discardable overlay.
+
+    Entries are copied into the overlay on first access, since callers mutate
+    nested values in place; :meth:`clear_overlay` drops every change.
+    """
+
+    __slots__ = ("_base", "_overlay", "_deleted")
+
+    def __init__(self, base: Dict[Any, Any]) -> None:
+        self._base = base
+        self._overlay: Dict[Any, Any] = {}
+        self._deleted: Set[Any] = set()
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._overlay[key]
+        except KeyError:
+            if key in self._deleted:
+                raise
+        value = self._overlay[key] = copy.deepcopy(self._base[key])
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._overlay[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: Any) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._overlay or (key in self._base and key not in self._deleted)
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def clear_overlay(self) -> None:
+        """Discard all writes and deletions, exposing the base again."""
+        self._overlay.clear()
+        self._deleted.clear()
+
+
 class MockTrueNASClient:
     """Mock TrueNAS client for development without real TrueNAS access."""
 
-    def __init__(self) -> None:
-        """Initialize mock client."""
+    def __init__(self, simulate_latency: bool = True) -> None:
+        """Initialize mock client.
+
+        Args:
+            simulate_latency: Sleep in each call to mimic API round-trips.
+                Tests pass False so calls complete without suspending.
+        """
+        self.simulate_latency = simulate_latency
         self.connected = False
         self.authenticated = False
         
@@ -171,8 +241,8 @@ class MockTrueNASClient:
             },
         ]
 
-        # Virtual machine mock data
-        self.mock_vms = {
+        # Virtual machine mock data (copy-on-write: reset() discards changes)
+        self.mock_vms: COWDict = COWDict({
             1: {
                 "id": 1,
                 "name": "ubuntu-server",
@@ -218,9 +288,10 @@ class MockTrueNASClient:
                     {"dtype": "CDROM", "attributes": {"path": "/mnt/Store/ISOs/Win11.iso"}},
                 ],
             },
-        }
+        })
 
-        self.mock_apps = {
+        # App mock data (copy-on-write: reset() discards changes)
+        self.mock_apps: COWDict = COWDict({
             "nginx-demo": {
                 "name": "nginx-demo",
                 "state": "RUNNING",
@@ -287,12 +358,25 @@ class MockTrueNASClient:
                 "active_workloads": {"containers": 1, "used_ports": [{"host": 8123, "container": 8123}]},
                 "metadata": {"app_version": "2025.1.0", "train": "custom"},
             },
-        }
+        })
+
+        self._snapshot_base = tuple(self.mock_snapshots)
+
+    def reset(self) -> None:
+        """Discard all changes made to the mock data since construction."""
+        self.mock_apps.clear_overlay()
+        self.mock_vms.clear_overlay()
+        self.mock_snapshots = list(self._snapshot_base)
+
+    async def _delay(self, seconds: float) -> None:
+        """Simulate API latency unless disabled."""
+        if self.simulate_latency:
+            await asyncio.sleep(seconds)
 
     async def connect(self) -> None:
         """Mock connection to TrueNAS."""
         logger.info("Mock: Connecting to TrueNAS")
-        await asyncio.sleep(0.1)  # Simulate connection delay
+        await self._delay(0.1)  # Simulate connection delay
         self.connected = True
         self.authenticated = True
         logger.info("Mock: Connected and authenticated successfully")
@@ -306,13 +390,13 @@ class MockTrueNASClient:
     async def test_connection(self) -> bool:
         """Mock connection test."""
         logger.info("Mock: Testing connection")
-        await asyncio.sleep(0.1)  # Simulate API call
+        await self._delay(0.1)  # Simulate API call
         return True
 
     async def list_custom_apps(self, status_filter: str = "all") -> List[Dict[str, Any]]:
         """Mock list Custom Apps."""
         logger.info("Mock: Listing Custom Apps", filter=status_filter)
-        await asyncio.sleep(0.2)  # Simulate API call
+        await self._delay(0.2)  # Simulate API call
         
         apps = list(self.mock_apps.values())
         
@@ -324,27 +408,27 @@ class MockTrueNASClient:
     async def get_app_status(self, app_name: str) -> str:
         """Mock get Custom App status."""
         logger.info("Mock: Getting app status", app=app_name)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         
         if app_name not in self.mock_apps:
-            raise Exception(f"App '{app_name}' not found")
+            raise AppNotFound(f"App '{app_name}' not found")
         
-        return self.mock_apps[app_name]["state"]
+        return str(self.mock_apps[app_name]["state"])
 
     async def get_app_config(self, app_name: str) -> Dict[str, Any]:
         """Mock get full Custom App configuration."""
         logger.info("Mock: Getting app config", app=app_name)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
 
         if app_name not in self.mock_apps:
-            raise Exception(f"App '{app_name}' not found")
+            raise AppNotFound(f"App '{app_name}' not found")
 
         return dict(self.mock_apps[app_name])
 
     async def update_app_config(self, app_name: str, config: Dict[str, Any]) -> bool:
         """Mock update Custom App configuration with raw config dict."""
         logger.info("Mock: Updating app config", app=app_name, keys=list(config.keys()))
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
 
         if app_name not in self.mock_apps:
             return False
@@ -367,7 +451,7 @@ class MockTrueNASClient:
     async def start_app(self, app_name: str) -> bool:
         """Mock start Custom App."""
         logger.info("Mock: Starting app", app=app_name)
-        await asyncio.sleep(0.5)  # Simulate start time
+        await self._delay(0.5)  # Simulate start time
         
         if app_name not in self.mock_apps:
             return False
@@ -378,7 +462,7 @@ class MockTrueNASClient:
     async def stop_app(self, app_name: str) -> bool:
         """Mock stop Custom App."""
         logger.info("Mock: Stopping app", app=app_name)
-        await asyncio.sleep(0.3)  # Simulate stop time
+        await self._delay(0.3)  # Simulate stop time
         
         if app_name not in self.mock_apps:
             return False
@@ -394,7 +478,7 @@ class MockTrueNASClient:
     ) -> str | None:
         """Mock deploy Custom App. Returns None on success, error string on failure."""
         logger.info("Mock: Deploying app", app=app_name, auto_start=auto_start)
-        await asyncio.sleep(1.0)  # Simulate deployment time
+        await self._delay(1.0)  # Simulate deployment time
 
         # Add new app to mock data
         self.mock_apps[app_name] = {
@@ -414,7 +498,7 @@ class MockTrueNASClient:
     ) -> bool:
         """Mock update Custom App."""
         logger.info("Mock: Updating app", app=app_name, force_recreate=force_recreate)
-        await asyncio.sleep(0.8)  # Simulate update time
+        await self._delay(0.8)  # Simulate update time
         
         if app_name not in self.mock_apps:
             return False
@@ -426,7 +510,7 @@ class MockTrueNASClient:
     async def delete_app(self, app_name: str, delete_volumes: bool = False) -> bool:
         """Mock delete Custom App."""
         logger.info("Mock: Deleting app", app=app_name, delete_volumes=delete_volumes)
-        await asyncio.sleep(0.4)  # Simulate deletion time
+        await self._delay(0.4)  # Simulate deletion time
         
         if app_name not in self.mock_apps:
             return False
@@ -442,7 +526,7 @@ class MockTrueNASClient:
     ) -> Tuple[bool, List[str]]:
         """Mock validate Docker Compose."""
         logger.info("Mock: Validating Docker Compose", check_security=check_security)
-        await asyncio.sleep(0.2)
+        await self._delay(0.2)
         
         issues = []
 
@@ -474,10 +558,10 @@ class MockTrueNASClient:
     ) -> str:
         """Mock get Custom App logs."""
         logger.info("Mock: Getting app logs", app=app_name, lines=lines, service=service_name)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
 
         if app_name not in self.mock_apps:
-            raise Exception(f"App '{app_name}' not found")
+            raise AppNotFound(f"App '{app_name}' not found")
 
         app = self.mock_apps[app_name]
         state = app.get("state", "UNKNOWN")
@@ -512,17 +596,17 @@ class MockTrueNASClient:
     async def get_compose_config(self, app_name: str) -> Dict[str, Any]:
         """Mock get Docker Compose config."""
         logger.info("Mock: Getting compose config", app=app_name)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
 
         if app_name not in self.mock_apps:
-            raise Exception(f"App '{app_name}' not found")
+            raise AppNotFound(f"App '{app_name}' not found")
 
         return dict(self.mock_apps[app_name].get("config", {}))
 
     async def update_compose_config(self, app_name: str, compose_yaml: str) -> bool:
         """Mock update Docker Compose config."""
         logger.info("Mock: Updating compose config", app=app_name)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
 
         if app_name not in self.mock_apps:
             return False
@@ -538,7 +622,7 @@ class MockTrueNASClient:
     ) -> str:
         """Mock read file from TrueNAS."""
         logger.info("Mock: Reading file", path=path, tail_lines=tail_lines)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return f"[Mock file content for {path}]"
 
     async def list_directory(
@@ -549,7 +633,7 @@ class MockTrueNASClient:
         """Mock list directory contents."""
         import os
         logger.info("Mock: Listing directory", path=path)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
 
         normalized = os.path.normpath(path)
         if not normalized.startswith("/mnt"):
@@ -568,7 +652,7 @@ class MockTrueNASClient:
     ) -> List[Dict[str, Any]]:
         """Mock list ZFS datasets."""
         logger.info("Mock: Listing datasets", pool=pool_name)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
 
         if pool_name:
             return [d for d in self.mock_datasets if d["pool"] == pool_name]
@@ -580,7 +664,7 @@ class MockTrueNASClient:
     ) -> List[Dict[str, Any]]:
         """Mock list ZFS snapshots."""
         logger.info("Mock: Listing snapshots", dataset=dataset)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
 
         if dataset:
             return [s for s in self.mock_snapshots if s["dataset"] == dataset]
@@ -594,7 +678,7 @@ class MockTrueNASClient:
     ) -> Dict[str, Any]:
         """Mock create ZFS snapshot."""
         logger.info("Mock: Creating snapshot", dataset=dataset, name=name)
-        await asyncio.sleep(0.2)
+        await self._delay(0.2)
 
         if "/" not in dataset:
             raise ValueError(
@@ -616,7 +700,7 @@ class MockTrueNASClient:
     async def delete_snapshot(self, snapshot_name: str) -> bool:
         """Mock delete ZFS snapshot."""
         logger.info("Mock: Deleting snapshot", snapshot=snapshot_name)
-        await asyncio.sleep(0.2)
+        await self._delay(0.2)
 
         for i, snap in enumerate(self.mock_snapshots):
             if snap["name"] == snapshot_name:
@@ -637,7 +721,7 @@ class MockTrueNASClient:
     ) -> Dict[str, Any]:
         """Mock create VM."""
         logger.info("Mock: Creating VM", name=name, vcpus=vcpus, memory=memory)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
 
         new_id = max(self.mock_vms.keys(), default=0) + 1
         self.mock_vms[new_id] = {
@@ -658,10 +742,10 @@ class MockTrueNASClient:
     ) -> Dict[str, Any]:
         """Mock add device to VM."""
         logger.info("Mock: Adding device to VM", vm_id=vm_id, dtype=dtype)
-        await asyncio.sleep(0.2)
+        await self._delay(0.2)
 
         if vm_id not in self.mock_vms:
-            raise Exception(f"VM with id {vm_id} not found")
+            raise VMNotFound(f"VM with id {vm_id} not found")
 
         device = {"dtype": dtype, "attributes": attributes}
         self.mock_vms[vm_id]["devices"].append(device)
@@ -671,9 +755,9 @@ class MockTrueNASClient:
     async def query_vm_devices(self, vm_id: int) -> List[Dict[str, Any]]:
         """Mock query VM devices."""
         logger.info("Mock: Querying VM devices", vm_id=vm_id)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         if vm_id not in self.mock_vms:
-            raise Exception(f"VM with id {vm_id} not found")
+            raise VMNotFound(f"VM with id {vm_id} not found")
         devices = []
         for i, dev in enumerate(self.mock_vms[vm_id]["devices"]):
             devices.append({"id": i + 1, "vm": vm_id, "order": 1000 + i, **dev})
@@ -684,27 +768,27 @@ class MockTrueNASClient:
     ) -> Dict[str, Any]:
         """Mock update VM device."""
         logger.info("Mock: Updating VM device", device_id=device_id, updates=updates)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return {"id": device_id, **updates}
 
     async def list_vms(self) -> List[Dict[str, Any]]:
         """Mock list VMs."""
         logger.info("Mock: Listing VMs")
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return list(self.mock_vms.values())
 
     async def get_vm_status(self, vm_id: int) -> Dict[str, Any]:
         """Mock get VM status."""
         logger.info("Mock: Getting VM status", vm_id=vm_id)
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         if vm_id not in self.mock_vms:
-            raise Exception(f"VM with id {vm_id} not found")
+            raise VMNotFound(f"VM with id {vm_id} not found")
         return dict(self.mock_vms[vm_id])
 
     async def start_vm(self, vm_id: int) -> bool:
         """Mock start VM."""
         logger.info("Mock: Starting VM", vm_id=vm_id)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
         if vm_id not in self.mock_vms:
             return False
         self.mock_vms[vm_id]["status"] = {"state": "RUNNING", "pid": 99999}
@@ -715,7 +799,7 @@ class MockTrueNASClient:
     ) -> bool:
         """Mock stop VM."""
         logger.info("Mock: Stopping VM", vm_id=vm_id, force=force)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
         if vm_id not in self.mock_vms:
             return False
         self.mock_vms[vm_id]["status"] = {"state": "STOPPED", "pid": None}
@@ -724,7 +808,7 @@ class MockTrueNASClient:
     async def poweroff_vm(self, vm_id: int) -> bool:
         """Mock power off VM."""
         logger.info("Mock: Powering off VM", vm_id=vm_id)
-        await asyncio.sleep(0.2)
+        await self._delay(0.2)
         if vm_id not in self.mock_vms:
             return False
         self.mock_vms[vm_id]["status"] = {"state": "STOPPED", "pid": None}
@@ -735,7 +819,7 @@ class MockTrueNASClient:
     ) -> bool:
         """Mock delete VM."""
         logger.info("Mock: Deleting VM", vm_id=vm_id, delete_zvols=delete_zvols)
-        await asyncio.sleep(0.3)
+        await self._delay(0.3)
         if vm_id not in self.mock_vms:
             return False
         del self.mock_vms[vm_id]
@@ -746,17 +830,17 @@ class MockTrueNASClient:
     async def get_system_info(self) -> Dict[str, Any]:
         """Mock get system information."""
         logger.info("Mock: Getting system info")
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return dict(self.mock_system_info)
 
     async def get_storage_pools(self) -> List[Dict[str, Any]]:
         """Mock get storage pools."""
         logger.info("Mock: Getting storage pools")
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return list(self.mock_pools)
 
     async def get_network_info(self) -> List[Dict[str, Any]]:
         """Mock get network interfaces."""
         logger.info("Mock: Getting network info")
-        await asyncio.sleep(0.1)
+        await self._delay(0.1)
         return list(self.mock_interfaces)
\ No newline at end of file
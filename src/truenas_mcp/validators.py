@@ -10,6 +10,9 @@ import yaml
 # Max YAML input size (100KB)
 MAX_YAML_SIZE = 100 * 1024
 
+# libyaml-backed loader when PyYAML was built with it, same safe semantics
+SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 logger = structlog.get_logger(__name__)
 
 
@@ -60,7 +63,7 @@ class ComposeValidator:
 
         # YAML syntax validation
         try:
-            compose_data = yaml.safe_load(compose_yaml)
+            compose_data = yaml.load(compose_yaml, Loader=SAFE_LOADER)
         except yaml.YAMLError as e:
             issues.append(f"Invalid YAML syntax: {e}")
             return False, issues
@@ -5,6 +5,9 @@ import asyncio
 from unittest.mock import patch
 import os
 
+from truenas_mcp.mcp_tools import MCPToolsHandler
+from truenas_mcp.mock_client import MockTrueNASClient
+
 # Configure asyncio event loop for pytest-asyncio
 @pytest.fixture(scope="session")
 def event_loop():
@@ -14,6 +17,27 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="session")
+async def connected_client():
+    """Connected mock TrueNAS client, shared across the session."""
+    client = MockTrueNASClient(simulate_latency=False)
+    await client.connect()
+    return client
+
+
+@pytest.fixture
+def tools_handler(connected_client):
+    """Tools handler over the shared client; mock data is reset afterwards."""
+    yield MCPToolsHandler(connected_client)
+    connected_client.reset()
+
+
+@pytest.fixture(scope="session")
+async def all_tools():
+    """MCP tool definitions, built once for the whole session."""
+    return await MCPToolsHandler(None).list_tools()
+
+
 @pytest.fixture
 def mock_environment():
     """Mock environment variables for testing."""
@@ -234,6 +258,26 @@ def anyio_backends():
     return ["asyncio"]
 
 
+def pytest_addoption(parser):
+    """Register suite-specific command line options."""
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="skip the mocked real-client tests for a quicker inner loop",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the real-client suite when running with --fast."""
+    if not config.getoption("--fast"):
+        return
+    skip = pytest.mark.skip(reason="skipped with --fast")
+    for item in items:
+        if "::TestTrueNASClient" in item.nodeid:
+            item.add_marker(skip)
+
+
 # Test configuration
 def pytest_configure(config):
     """Configure pytest with custom markers."""
@@ -0,0 +1,22 @@
+"""Shared helpers for tests."""
+
+from typing import Any, Callable, Coroutine
+
+
+def raising_async(exc: BaseException) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Return a coroutine function that raises ``exc`` when awaited.
+
+    A lightweight stand-in for ``AsyncMock(side_effect=exc)`` when the test
+    doesn't need call assertions.
+    """
+
+    async def _raise(*args: Any, **kwargs: Any) -> Any:
+        raise exc
+
+    return _raise
+
+
+def assert_all_in(text: str, *needles: str) -> None:
+    """Assert every needle occurs in ``text``."""
+    missing = [n for n in needles if n not in text]
+    assert not missing, f"Missing from text: {missing}"
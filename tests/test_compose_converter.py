@@ -1,7 +1,6 @@
 """Tests for Docker Compose to TrueNAS converter."""
 
 import pytest
-from unittest.mock import AsyncMock
 
 from truenas_mcp.compose_converter import DockerComposeConverter
 
@@ -14,7 +13,6 @@ class TestDockerComposeConverter:
         """Create converter instance."""
         return DockerComposeConverter()
 
-    @pytest.mark.asyncio
     async def test_basic_conversion(self, converter):
         """Test basic Docker Compose conversion."""
         compose_yaml = """
@@ -50,7 +48,6 @@ volumes:
         assert "storage" in svc
         assert "environment" in svc
 
-    @pytest.mark.asyncio
     async def test_image_conversion_no_tag(self, converter):
         """Test image conversion without explicit tag."""
         compose_yaml = """
@@ -66,7 +63,6 @@ services:
         assert svc["image"]["repository"] == "nginx"
         assert svc["image"]["tag"] == "latest"
 
-    @pytest.mark.asyncio
     async def test_network_conversion_simple_ports(self, converter):
         """Test network conversion with simple port mapping."""
         compose_yaml = """
@@ -98,7 +94,6 @@ services:
         assert port_forwards[1]["container_port"] == 443
         assert port_forwards[1]["protocol"] == "tcp"
 
-    @pytest.mark.asyncio
     async def test_network_conversion_no_ports(self, converter):
         """Test network conversion without port mappings."""
         compose_yaml = """
@@ -114,7 +109,6 @@ services:
         assert network["type"] == "bridge"
         assert "port_forwards" not in network
 
-    @pytest.mark.asyncio
     async def test_port_with_protocol(self, converter):
         """Test port parsing with protocol suffix."""
         compose_yaml = """
@@ -134,7 +128,6 @@ services:
         assert port_forwards[0]["protocol"] == "udp"
         assert port_forwards[1]["protocol"] == "tcp"
 
-    @pytest.mark.asyncio
     async def test_storage_conversion_host_paths(self, converter):
         """Test storage conversion with host path volumes."""
         compose_yaml = """
@@ -166,7 +159,6 @@ services:
         assert volume_1["mount_path"] == "/etc/config"
         assert volume_1["read_only"] is True
 
-    @pytest.mark.asyncio
     async def test_storage_conversion_named_volumes(self, converter):
         """Test storage conversion with named volumes (IX volumes)."""
         compose_yaml = """
@@ -195,7 +187,25 @@ volumes:
         assert volume_0["ix_volume_config"]["acl_enable"] is False
         assert volume_0["mount_path"] == "/var/lib/app"
 
-    @pytest.mark.asyncio
+    async def test_storage_conversion_top_level_volumes_list(self, converter):
+        """Test a list-form top-level volumes key doesn't break conversion."""
+        compose_yaml = """
+version: '3'
+services:
+  web:
+    image: nginx
+    volumes:
+      - app_data:/var/lib/app
+volumes:
+  - app_data
+"""
+
+        result = await converter.convert(compose_yaml, "test-app")
+
+        volume_0 = result["services"][0]["storage"]["volume_0"]
+        assert volume_0["type"] == "ix_volume"
+        assert volume_0["ix_volume_config"]["dataset_name"] == "app_data"
+
     async def test_environment_conversion_list_format(self, converter):
         """Test environment variable conversion from list format."""
         compose_yaml = """
@@ -216,7 +226,6 @@ services:
         assert environment["NGINX_PORT"] == "80"
         assert environment["DEBUG"] == "true"
 
-    @pytest.mark.asyncio
     async def test_environment_conversion_dict_format(self, converter):
         """Test environment variable conversion from dict format."""
         compose_yaml = """
@@ -237,7 +246,6 @@ services:
         assert environment["NGINX_PORT"] == 80
         assert environment["DEBUG"] is True
 
-    @pytest.mark.asyncio
     async def test_environment_conversion_no_env(self, converter):
         """Test environment conversion with no environment variables."""
         compose_yaml = """
@@ -252,7 +260,6 @@ services:
         environment = result["services"][0]["environment"]
         assert environment == {}
 
-    @pytest.mark.asyncio
     async def test_invalid_yaml(self, converter):
         """Test conversion with invalid YAML."""
         invalid_yaml = "key: [unterminated"
@@ -260,7 +267,6 @@ services:
         with pytest.raises(ValueError, match="Invalid YAML"):
             await converter.convert(invalid_yaml, "test-app")
 
-    @pytest.mark.asyncio
     async def test_no_services(self, converter):
         """Test conversion with no services defined."""
         compose_yaml = """
@@ -272,7 +278,16 @@ networks:
         with pytest.raises(ValueError, match="No services found"):
             await converter.convert(compose_yaml, "test-app")
 
-    @pytest.mark.asyncio
+    async def test_services_only_in_comment(self, converter):
+        """Test a document mentioning services only in a comment has none."""
+        compose_yaml = """
+# services are defined elsewhere
+version: '3'
+"""
+
+        with pytest.raises(ValueError, match="No services found"):
+            await converter.convert(compose_yaml, "test-app")
+
     async def test_empty_services(self, converter):
         """Test conversion with empty services."""
         compose_yaml = """
@@ -283,7 +298,6 @@ services: {}
         with pytest.raises(ValueError, match="No services found"):
             await converter.convert(compose_yaml, "test-app")
 
-    @pytest.mark.asyncio
     async def test_multi_service_conversion(self, converter):
         """Test conversion handles all services in a compose file."""
         compose_yaml = """
@@ -318,7 +332,6 @@ services:
         assert db["network"]["port_forwards"][0]["host_port"] == 5432
         assert db["environment"]["POSTGRES_PASSWORD"] == "secret"
 
-    @pytest.mark.asyncio
     async def test_three_service_conversion(self, converter):
         """Test conversion handles a typical 3-service stack."""
         compose_yaml = """
@@ -344,7 +357,6 @@ services:
         names = [s["name"] for s in result["services"]]
         assert names == ["app", "db", "redis"]
 
-    @pytest.mark.asyncio
     async def test_complex_compose_conversion(self, converter):
         """Test conversion of complex Docker Compose file."""
         compose_yaml = """
@@ -414,7 +426,6 @@ networks:
 
         assert found_ix_volume, "Should have IX volumes for named volumes"
 
-    @pytest.mark.asyncio
     async def test_yaml_size_limit(self, converter):
         """Test that oversized YAML input is rejected."""
         huge_yaml = "x" * (100 * 1024 + 1)
@@ -422,7 +433,6 @@ networks:
         with pytest.raises(ValueError, match="exceeds maximum size"):
             await converter.convert(huge_yaml, "test-app")
 
-    @pytest.mark.asyncio
     async def test_path_traversal_normalized(self, converter):
         """Test that path traversal attempts are normalized."""
         compose_yaml = """
@@ -437,7 +447,7 @@ services:
         result = await converter.convert(compose_yaml, "test-app")
         storage = result["services"][0]["storage"]
         volume = storage["volume_0"]
-        # os.path.normpath resolves /mnt/pool/../etc to /mnt/etc
+        # posixpath.normpath resolves /mnt/pool/../etc to /mnt/etc
         # which does NOT start with /mnt/ followed by a pool name,
         # but does start with /mnt/ so it's treated as host_path
         # The normpath prevents the actual traversal
@@ -20,7 +20,7 @@ from truenas_mcp.mock_client import MockTrueNASClient
 @pytest.fixture
 async def live_handler():
     """MCPToolsHandler with a connected mock client."""
-    client = MockTrueNASClient()
+    client = MockTrueNASClient(simulate_latency=False)
     await client.connect()
     return MCPToolsHandler(client)
 
@@ -39,14 +39,12 @@ async def discovery_handler(live_handler):
 class TestDiscoveryHandler:
     """Validate the search + execute meta-tool surface."""
 
-    @pytest.mark.asyncio
     async def test_list_tools_only_returns_two_meta_tools(self, discovery_handler):
         tools = await discovery_handler.list_tools()
         assert len(tools) == 2
         names = [t.name for t in tools]
         assert names == ["search_tools", "execute_tool"]
 
-    @pytest.mark.asyncio
     async def test_search_empty_returns_all_tools_grouped(self, discovery_handler):
         result = await discovery_handler.call_tool("search_tools", {})
         payload = json.loads(result.text)
@@ -58,7 +56,6 @@ class TestDiscoveryHandler:
         for entry in payload["tools"]:
             assert "name" in entry and "category" in entry and "description" in entry
 
-    @pytest.mark.asyncio
     async def test_search_by_query(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "search_tools", {"query": "snapshot"}
@@ -69,7 +66,6 @@ class TestDiscoveryHandler:
         # Sanity: unrelated tools are filtered out.
         assert "get_system_info" not in names
 
-    @pytest.mark.asyncio
     async def test_search_by_category(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "search_tools", {"category": "vm"}
@@ -80,7 +76,6 @@ class TestDiscoveryHandler:
         )
         assert all(t["category"] == "vm" for t in payload["tools"])
 
-    @pytest.mark.asyncio
     async def test_search_returns_full_schema_for_exact_name(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "search_tools", {"name": "create_snapshot"}
@@ -93,7 +88,6 @@ class TestDiscoveryHandler:
         assert "dataset" in schema["properties"]
         assert "name" in schema["properties"]
 
-    @pytest.mark.asyncio
     async def test_search_unknown_name(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "search_tools", {"name": "nope_not_a_tool"}
@@ -101,7 +95,6 @@ class TestDiscoveryHandler:
         payload = json.loads(result.text)
         assert "error" in payload
 
-    @pytest.mark.asyncio
     async def test_execute_routes_to_live_handler(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "execute_tool",
@@ -110,7 +103,6 @@ class TestDiscoveryHandler:
         assert result.type == "text"
         assert "connection successful" in result.text.lower()
 
-    @pytest.mark.asyncio
     async def test_execute_unknown_tool_rejected(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "execute_tool",
@@ -118,14 +110,12 @@ class TestDiscoveryHandler:
         )
         assert "not found" in result.text.lower()
 
-    @pytest.mark.asyncio
     async def test_execute_requires_name(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "execute_tool", {"arguments": {}}
         )
         assert "requires a 'name'" in result.text
 
-    @pytest.mark.asyncio
     async def test_execute_rejects_non_object_arguments(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "execute_tool",
@@ -133,12 +123,10 @@ class TestDiscoveryHandler:
         )
         assert "must be an object" in result.text
 
-    @pytest.mark.asyncio
     async def test_unknown_meta_tool(self, discovery_handler):
         result = await discovery_handler.call_tool("whatever", {})
         assert "Unknown discovery tool" in result.text
 
-    @pytest.mark.asyncio
     async def test_search_respects_limit(self, discovery_handler):
         result = await discovery_handler.call_tool(
             "search_tools", {"limit": 3}
@@ -167,7 +155,6 @@ class TestDiscoveryServerIntegration:
         with patch.dict(os.environ, env, clear=False):
             yield env
 
-    @pytest.mark.asyncio
     async def test_server_exposes_two_tools_in_discovery_mode(self, discovery_env):
         server = TrueNASMCPServer()
         assert server.config["discovery_mode"] is True
@@ -176,14 +163,12 @@ class TestDiscoveryServerIntegration:
         tools = await server.discovery_handler.list_tools()
         assert [t.name for t in tools] == ["search_tools", "execute_tool"]
 
-    @pytest.mark.asyncio
     async def test_server_defaults_to_full_registry(self):
         with patch.dict(os.environ, {"MOCK_TRUENAS": "true"}, clear=False):
             server = TrueNASMCPServer()
             assert server.config["discovery_mode"] is False
             assert server.discovery_handler is None
 
-    @pytest.mark.asyncio
     async def test_discovery_execute_initializes_client_lazily(self, discovery_env):
         server = TrueNASMCPServer()
         assert server.tools_handler is None
@@ -1,18 +1,21 @@
 """Tests for main MCP server functionality."""
 
-import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from truenas_mcp.mcp_server import TrueNASMCPServer
+from truenas_mcp.mcp_server import _ENV_SPEC, TrueNASMCPServer
 from truenas_mcp.mock_client import MockTrueNASClient
 
 
+# Every environment variable the server reads at construction time
+SERVER_ENV_VARS = tuple(env for _, env, _, _ in _ENV_SPEC)
+
+
 class TestTrueNASMCPServer:
     """Test MCP server functionality."""
 
     @pytest.fixture
-    def mock_env(self):
+    def mock_env(self, monkeypatch):
         """Mock environment variables."""
         env_vars = {
             "TRUENAS_HOST": "test.example.com",
@@ -24,8 +27,9 @@ class TestTrueNASMCPServer:
             "MOCK_TRUENAS": "true",
         }
 
-        with patch.dict(os.environ, env_vars, clear=False):
-            yield env_vars
+        for key, value in env_vars.items():
+            monkeypatch.setenv(key, value)
+        return env_vars
 
     @pytest.fixture
     def server(self, mock_env):
@@ -42,21 +46,22 @@ class TestTrueNASMCPServer:
         assert server.config["debug_mode"] is True
         assert server.config["mock_mode"] is True
 
-    def test_server_initialization_defaults(self):
+    def test_server_initialization_defaults(self, monkeypatch):
         """Test server initialization with default values."""
-        with patch.dict(os.environ, {}, clear=True):
-            server = TrueNASMCPServer()
-
-            assert server.config["truenas_host"] == "nas.pvnkn3t.lan"
-            assert server.config["truenas_password"] is None
-            assert server.config["truenas_api_key"] is None
-            assert server.config["truenas_port"] == 443
-            assert server.config["truenas_protocol"] == "wss"
-            assert server.config["ssl_verify"] is True
-            assert server.config["debug_mode"] is False
-            assert server.config["mock_mode"] is False
-
-    @pytest.mark.asyncio
+        for key in SERVER_ENV_VARS:
+            monkeypatch.delenv(key, raising=False)
+
+        server = TrueNASMCPServer()
+
+        assert server.config["truenas_host"] == "nas.pvnkn3t.lan"
+        assert server.config["truenas_password"] is None
+        assert server.config["truenas_api_key"] is None
+        assert server.config["truenas_port"] == 443
+        assert server.config["truenas_protocol"] == "wss"
+        assert server.config["ssl_verify"] is True
+        assert server.config["debug_mode"] is False
+        assert server.config["mock_mode"] is False
+
     async def test_initialize_clients_mock_mode(self, server):
         """Test client initialization in mock mode."""
         await server._initialize_clients()
@@ -65,7 +70,6 @@ class TestTrueNASMCPServer:
         assert isinstance(server.truenas_client, MockTrueNASClient)
         assert server.tools_handler is not None
 
-    @pytest.mark.asyncio
     async def test_initialize_clients_idempotent(self, server):
         """Test that repeated initialization is safe (lock + guard)."""
         await server._initialize_clients()
@@ -74,18 +78,18 @@ class TestTrueNASMCPServer:
         await server._initialize_clients()
         assert server.tools_handler is first_handler  # Same instance
 
-    @pytest.mark.asyncio
-    async def test_initialize_clients_real_mode_no_credentials(self):
+    async def test_initialize_clients_real_mode_no_credentials(self, monkeypatch):
         """Test client initialization in real mode without credentials."""
-        with patch.dict(os.environ, {"MOCK_TRUENAS": "false"}, clear=False):
-            server = TrueNASMCPServer()
+        monkeypatch.setenv("MOCK_TRUENAS", "false")
+        server = TrueNASMCPServer()
 
-            with pytest.raises(ValueError, match="TRUENAS_PASSWORD or TRUENAS_API_KEY environment variable required"):
-                await server._initialize_clients()
+        with pytest.raises(ValueError, match="TRUENAS_PASSWORD or TRUENAS_API_KEY environment variable required"):
+            await server._initialize_clients()
 
-    @pytest.mark.asyncio
     @patch('truenas_mcp.mcp_server.TrueNASClient')
-    async def test_initialize_clients_real_mode_with_password(self, mock_client_class):
+    async def test_initialize_clients_real_mode_with_password(
+        self, mock_client_class, monkeypatch
+    ):
         """Test client initialization in real mode with password."""
         mock_client = AsyncMock()
         mock_client_class.return_value = mock_client
@@ -96,28 +100,29 @@ class TestTrueNASMCPServer:
             "MOCK_TRUENAS": "false",
         }
 
-        with patch.dict(os.environ, env_vars, clear=False):
-            server = TrueNASMCPServer()
-            await server._initialize_clients()
-
-            # Check client was created with correct parameters
-            mock_client_class.assert_called_once_with(
-                host="test.example.com",
-                username="mcp-service",
-                password="test-password",
-                api_key=None,
-                port=443,
-                protocol="wss",
-                ssl_verify=True,
-            )
+        for key, value in env_vars.items():
+            monkeypatch.setenv(key, value)
 
-            # Check client connect was called
-            mock_client.connect.assert_called_once()
+        server = TrueNASMCPServer()
+        await server._initialize_clients()
 
-            assert server.truenas_client == mock_client
-            assert server.tools_handler is not None
+        # Check client was created with correct parameters
+        mock_client_class.assert_called_once_with(
+            host="test.example.com",
+            username="mcp-service",
+            password="test-password",
+            api_key=None,
+            port=443,
+            protocol="wss",
+            ssl_verify=True,
+        )
+
+        # Check client connect was called
+        mock_client.connect.assert_called_once()
+
+        assert server.truenas_client == mock_client
+        assert server.tools_handler is not None
 
-    @pytest.mark.asyncio
     async def test_cleanup(self, server):
         """Test server cleanup."""
         # Initialize client
@@ -130,17 +135,15 @@ class TestTrueNASMCPServer:
 
         mock_client.disconnect.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_cleanup_no_client(self, server):
         """Test server cleanup without initialized client."""
         # Should not raise exception
         await server.cleanup()
 
-    @pytest.mark.asyncio
     @patch('truenas_mcp.mcp_server.stdio_server')
     async def test_run_method(self, mock_stdio_server, server):
         """Test server run method."""
-        mock_streams = (AsyncMock(), AsyncMock())
+        mock_streams = (MagicMock(), MagicMock())
         mock_stdio_server.return_value.__aenter__.return_value = mock_streams
 
         server.server.run = AsyncMock()
@@ -154,7 +157,6 @@ class TestTrueNASMCPServer:
         # Third argument should be initialization options
         assert len(call_args[0]) == 3
 
-    @pytest.mark.asyncio
     async def test_tools_handler_integration(self, server):
         """Test tools handler works after initialization."""
         await server._initialize_clients()
@@ -174,7 +176,6 @@ class TestTrueNASMCPServer:
 class TestMainFunction:
     """Test main entry point function."""
 
-    @pytest.mark.asyncio
     @patch('truenas_mcp.mcp_server.stdio_server')
     @patch('truenas_mcp.mcp_server.TrueNASMCPServer')
     async def test_main_normal_execution(self, mock_server_class, mock_stdio_server):
@@ -186,7 +187,7 @@ class TestMainFunction:
         mock_server_class.return_value = mock_server
 
         # Mock stdio streams
-        mock_streams = (AsyncMock(), AsyncMock())
+        mock_streams = (MagicMock(), MagicMock())
         mock_stdio_server.return_value.__aenter__.return_value = mock_streams
 
         # Run main
@@ -197,7 +198,6 @@ class TestMainFunction:
         mock_server.run.assert_called_once_with(*mock_streams)
         mock_server.cleanup.assert_called_once()
 
-    @pytest.mark.asyncio
     @patch('truenas_mcp.mcp_server.stdio_server')
     @patch('truenas_mcp.mcp_server.TrueNASMCPServer')
     async def test_main_keyboard_interrupt(self, mock_server_class, mock_stdio_server):
@@ -210,7 +210,7 @@ class TestMainFunction:
         mock_server_class.return_value = mock_server
 
         # Mock stdio streams
-        mock_streams = (AsyncMock(), AsyncMock())
+        mock_streams = (MagicMock(), MagicMock())
         mock_stdio_server.return_value.__aenter__.return_value = mock_streams
 
         # Run main - should handle KeyboardInterrupt gracefully
@@ -219,7 +219,6 @@ class TestMainFunction:
         # Verify cleanup was still called
         mock_server.cleanup.assert_called_once()
 
-    @pytest.mark.asyncio
     @patch('truenas_mcp.mcp_server.stdio_server')
     @patch('truenas_mcp.mcp_server.TrueNASMCPServer')
     @patch('sys.exit')
@@ -233,7 +232,7 @@ class TestMainFunction:
         mock_server_class.return_value = mock_server
 
         # Mock stdio streams
-        mock_streams = (AsyncMock(), AsyncMock())
+        mock_streams = (MagicMock(), MagicMock())
         mock_stdio_server.return_value.__aenter__.return_value = mock_streams
 
         # Run main - should handle exception and exit
@@ -13,7 +13,6 @@ class TestComposeValidator:
         """Create validator instance."""
         return ComposeValidator()
 
-    @pytest.mark.asyncio
     async def test_valid_compose(self, validator):
         """Test validation of valid Docker Compose."""
         compose_yaml = """
@@ -35,7 +34,6 @@ services:
         assert is_valid is True
         assert isinstance(issues, list)
 
-    @pytest.mark.asyncio
     async def test_invalid_yaml_syntax(self, validator):
         """Test validation with invalid YAML syntax."""
         invalid_yaml = """
@@ -54,7 +52,6 @@ services:
         assert len(issues) > 0
         assert any("Invalid YAML syntax" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_missing_services(self, validator):
         """Test validation with missing services section."""
         compose_yaml = """
@@ -68,7 +65,6 @@ networks:
         assert is_valid is False
         assert any("Missing required 'services' section" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_empty_services(self, validator):
         """Test validation with empty services."""
         compose_yaml = """
@@ -81,7 +77,6 @@ services: {}
         assert is_valid is False
         assert any("Services section cannot be empty" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_old_compose_version(self, validator):
         """Test validation with old Docker Compose version."""
         compose_yaml = """
@@ -95,7 +90,6 @@ services:
 
         assert any("version should be 2.0 or higher" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_service_without_image_or_build(self, validator):
         """Test validation of service without image or build."""
         compose_yaml = """
@@ -111,7 +105,6 @@ services:
         assert is_valid is False
         assert any("must have either 'image' or 'build'" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_invalid_service_name(self, validator):
         """Test validation with invalid service name."""
         compose_yaml = """
@@ -125,7 +118,6 @@ services:
 
         assert any("contains invalid characters" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_security_privileged_container(self, validator):
         """Test security validation catches privileged containers."""
         compose_yaml = """
@@ -141,7 +133,6 @@ services:
         assert is_valid is False
         assert any("Privileged containers are not allowed" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_security_host_network(self, validator):
         """Test security validation catches host network mode."""
         compose_yaml = """
@@ -156,7 +147,6 @@ services:
 
         assert any("Host network mode should be avoided" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_security_dangerous_bind_mounts(self, validator):
         """Test security validation catches dangerous bind mounts."""
         compose_yaml = """
@@ -175,7 +165,6 @@ services:
         assert any("System directory bind mounts are not allowed" in issue for issue in issues)
         assert any("Docker socket access is not allowed" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_security_dangerous_capabilities(self, validator):
         """Test security validation catches dangerous capabilities."""
         compose_yaml = """
@@ -194,7 +183,6 @@ services:
         assert any("SYS_ADMIN" in issue and "not allowed" in issue for issue in issues)
         assert any("NET_ADMIN" in issue and "not allowed" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_security_warnings(self, validator):
         """Test security validation generates warnings for risky patterns."""
         compose_yaml = """
@@ -211,10 +199,10 @@ services:
 
         # Should be valid (warnings only, plus the invalid port format error from *)
         # The "*:80" causes an invalid port format error
-        assert any("binding to all interfaces" in issue.lower() for issue in issues)
-        assert any("unless-stopped" in issue.lower() for issue in issues)
+        lowered = [issue.lower() for issue in issues]
+        assert any("binding to all interfaces" in issue for issue in lowered)
+        assert any("unless-stopped" in issue for issue in lowered)
 
-    @pytest.mark.asyncio
     async def test_security_disabled(self, validator):
         """Test validation with security checks disabled."""
         compose_yaml = """
@@ -236,7 +224,6 @@ services:
         ]
         assert len(security_issues) == 0
 
-    @pytest.mark.asyncio
     async def test_truenas_compatibility_relative_paths(self, validator):
         """Test TrueNAS compatibility validation catches relative paths."""
         compose_yaml = """
@@ -254,7 +241,6 @@ services:
         assert is_valid is False
         assert any("Relative paths in volumes are not supported" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_truenas_compatibility_non_pool_paths(self, validator):
         """Test TrueNAS compatibility validation suggests pool paths."""
         compose_yaml = """
@@ -270,7 +256,6 @@ services:
 
         assert any("should start with /mnt/" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_truenas_compatibility_privileged_ports(self, validator):
         """Test TrueNAS compatibility validation warns about privileged ports."""
         compose_yaml = """
@@ -288,7 +273,6 @@ services:
         # Port 22 should trigger warning, port 80 is allowed
         assert any("Privileged port 22" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_truenas_compatibility_external_networks(self, validator):
         """Test TrueNAS compatibility validation warns about external networks."""
         compose_yaml = """
@@ -305,7 +289,6 @@ networks:
 
         assert any("External network" in issue and "may not work" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_truenas_compatibility_invalid_ports(self, validator):
         """Test TrueNAS compatibility validation catches invalid port formats."""
         compose_yaml = """
@@ -358,7 +341,6 @@ services:
             assert any(expected_error in issue for issue in issues), \
                 f"Expected error '{expected_error}' not found in {issues}"
 
-    @pytest.mark.asyncio
     async def test_complex_validation_scenario(self, validator):
         """Test complex validation scenario with multiple issues."""
         compose_yaml = """
@@ -412,7 +394,6 @@ networks:
         # Warnings
         assert "unless-stopped" in issue_text
 
-    @pytest.mark.asyncio
     async def test_yaml_size_limit(self, validator):
         """Test that oversized YAML is rejected."""
         huge_yaml = "x" * (100 * 1024 + 1)
@@ -422,7 +403,6 @@ networks:
         assert is_valid is False
         assert any("exceeds maximum" in issue for issue in issues)
 
-    @pytest.mark.asyncio
     async def test_path_traversal_detected(self, validator):
         """Test that path traversal is caught after normalization."""
         compose_yaml = """